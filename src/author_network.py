@@ -0,0 +1,195 @@
+import os
+import re
+import sys
+import unicodedata
+from collections import Counter
+from itertools import combinations
+
+from bib_dedup import DedupIndex
+from external_counter import ExternalPairCounter, parse_memory_budget
+
+# Papers with more authors than this only count towards the author nodes, not the links,
+# so a single consortium paper cannot add tens of thousands of pairs
+MAX_AUTHORS = 50
+
+# Memory used for counting co-author pairs in streaming mode, in bytes
+STREAMING_MEMORY_BUDGET = 64 * 2**20
+
+
+def normalize_author_name(name):
+    """
+    Turn a BibTeX author name into a matching key and a display label.
+    LaTeX accents and braces are removed, "Last, First" is reordered, and the key keeps
+    only the first given name and the surname, so "Sidney K. D'Mello" and "Sidney D'Mello" match.
+    """
+    # Drop LaTeX accent commands and braces: {\'{o}} -> o, {-} -> -
+    name = re.sub(r"\\[`'\"^~=.uvHckr]\s*", '', name)
+    name = name.replace('{', '').replace('}', '')
+    name = ' '.join(name.split())
+
+    if ',' in name:
+        last, first = name.split(',', 1)
+        name = f"{first.strip()} {last.strip()}"
+    label = name
+
+    ascii_name = unicodedata.normalize('NFKD', name).encode('ascii', 'ignore').decode('ascii')
+    tokens = re.sub(r"[^\w\s-]", '', ascii_name.lower()).split()
+    if len(tokens) > 2:
+        # Keep DBLP homonym numbers such as "Wei Wang 0001" with the surname
+        surname = tokens[-2:] if tokens[-1].isdigit() else tokens[-1:]
+        tokens = tokens[:1] + surname
+    return ' '.join(tokens), label
+
+
+def split_authors(author_field):
+    return [name for name in re.split(r'\s+and\s+', author_field.strip()) if name]
+
+
+def iter_bib_entries(bib_file_path, streaming=False):
+    """
+    Yield the entries of a .bib file.
+    In streaming mode the file is read line by line and each entry is parsed on its own,
+    so only one entry is held in memory at a time. A single parser is used for the whole
+    file, so @string macros it has seen stay defined for the entries that follow.
+    """
+    import bibtexparser
+    from bibtexparser.bparser import BibTexParser
+
+    if not streaming:
+        with open(bib_file_path, 'r') as bib_file:
+            yield from bibtexparser.loads(bib_file.read()).entries
+        return
+
+    parser = BibTexParser()
+    parser.expect_multiple_parse = True
+
+    def parse_chunk(chunk):
+        # The parser appends to its database, so take the new entries out after each chunk
+        bib_database = parser.parse(''.join(chunk))
+        entries, bib_database.entries = bib_database.entries, []
+        return entries
+
+    chunk = []
+    with open(bib_file_path, 'r') as bib_file:
+        for line in bib_file:
+            if line.startswith('@') and chunk:
+                yield from parse_chunk(chunk)
+                chunk = []
+            chunk.append(line)
+    if chunk:
+        yield from parse_chunk(chunk)
+
+
+def iter_paper_authors(directory_path, author_ids, author_labels, dedup_index, streaming=False):
+    """
+    Yield the sorted author ids of every unique paper in the .bib files of a directory.
+    Author names are interned to integer ids on the fly; entries already seen in
+    another file (same DOI, or same title and year) are skipped.
+    """
+    for filename in sorted(os.listdir(directory_path)):
+        if not filename.endswith('.bib'):
+            continue
+        file_path = os.path.join(directory_path, filename)
+        print(f"Processing file: {file_path}")
+
+        for entry in iter_bib_entries(file_path, streaming):
+            if 'author' not in entry:
+                continue
+            if dedup_index.is_duplicate(entry, filename):
+                continue
+
+            ids = set()
+            for name in split_authors(entry['author']):
+                key, label = normalize_author_name(name)
+                if key not in author_ids:
+                    author_ids[key] = len(author_labels)
+                    author_labels.append(label)
+                ids.add(author_ids[key])
+            yield sorted(ids)
+
+
+def iter_author_pairs(paper_authors, counting='full', max_authors=MAX_AUTHORS):
+    """
+    Yield (packed pair, weight) for every co-author pair, without building the pair list.
+    A pair (a, b) with a < b is packed into the single int a << 32 | b.
+    With fractional counting each paper contributes a total weight of n / 2, i.e. 1 / (n - 1) per pair.
+    """
+    for ids in paper_authors:
+        n = len(ids)
+        if n < 2 or n > max_authors:
+            continue
+        weight = 1 if counting == 'full' else 1 / (n - 1)
+        for a, b in combinations(ids, 2):
+            yield a << 32 | b, weight
+
+
+def build_coauthor_network(directory_path, counting='full', max_authors=MAX_AUTHORS, streaming=False,
+                           memory_budget=STREAMING_MEMORY_BUDGET):
+    """
+    Build the co-authorship network of the .bib files in a directory.
+    Returns the author labels (indexed by id), the number of papers per author,
+    the link weights and the dedup index of the run.
+    The link weights are a Counter keyed by packed author pair, or in streaming mode an
+    ExternalPairCounter of (author id, author id) pairs that keeps within memory_budget bytes.
+    """
+    dedup_index = DedupIndex()
+    author_ids = {}
+    author_labels = []
+    paper_counts = Counter()
+    link_weights = ExternalPairCounter(memory_budget) if streaming else Counter()
+
+    def count_papers(paper_authors):
+        for ids in paper_authors:
+            paper_counts.update(ids)
+            yield ids
+
+    paper_authors = count_papers(iter_paper_authors(directory_path, author_ids, author_labels, dedup_index, streaming))
+    for pair, weight in iter_author_pairs(paper_authors, counting, max_authors):
+        if streaming:
+            link_weights.add(pair >> 32, pair & 0xFFFFFFFF, weight)
+        else:
+            link_weights[pair] += weight
+
+    return author_labels, paper_counts, link_weights, dedup_index
+
+
+def save_for_vosviewer(author_labels, paper_counts, link_weights, map_file_path, network_file_path):
+    """
+    Save the author nodes and co-authorship links in the format required by VOSViewer.
+    Returns the number of links written.
+    """
+    with open(map_file_path, 'w') as nodes_file:
+        nodes_file.write("Id,Label,Weight\n")
+        for author_id, label in enumerate(author_labels):
+            nodes_file.write(f"{author_id + 1},\"{label}\",{paper_counts[author_id]}\n")
+
+    with open(network_file_path, 'w') as edges_file:
+        edges_file.write("Source,Target,Weight\n")
+        link_count = 0
+        for pair, weight in link_weights.items():
+            # Streaming runs yield (source, target) tuples instead of packed pairs
+            source, target = pair if isinstance(pair, tuple) else (pair >> 32, pair & 0xFFFFFFFF)
+            edges_file.write(f"{source + 1},{target + 1},{round(weight, 4)}\n")
+            link_count += 1
+
+    return link_count
+
+
+if __name__ == "__main__":
+    # Specify the directory containing the .bib files
+    bib_directory = 'data/bib'
+    counting = 'fractional' if '--fractional' in sys.argv else 'full'
+
+    # Step 1: Stream all .bib entries and count the co-author pairs
+    memory_budget = parse_memory_budget(sys.argv) or STREAMING_MEMORY_BUDGET
+    author_labels, paper_counts, link_weights, dedup_index = build_coauthor_network(
+        bib_directory, counting=counting, streaming='--streaming' in sys.argv, memory_budget=memory_budget
+    )
+
+    # Step 2: Save the data in a format required by VOSViewer
+    link_count = save_for_vosviewer(author_labels, paper_counts, link_weights,
+                                    'data/coauthor_map.txt', 'data/coauthor_network.txt')
+
+    dedup_index.report()
+    print(f"Authors: {len(author_labels)}, links: {link_count}")
+    print("VOSViewer files created successfully.")
@@ -1,12 +1,17 @@
 import os
-import bibtexparser
-from collections import defaultdict
+from collections import Counter
 from itertools import combinations
 
-def parse_bib_file_for_journals(bib_file_path):
+from bib_dedup import DedupIndex
+from external_counter import ExternalPairCounter, parse_memory_budget
+
+def parse_bib_file_for_journals(bib_file_path, dedup_index=None):
     """
     Parse a single .bib file and extract the journals from entries that have a "journal" field.
+    If a dedup index is given, entries already seen in another file are skipped.
     """
+    import bibtexparser
+
     with open(bib_file_path, 'r') as bib_file:
         bib_content = bib_file.read()
     
@@ -16,36 +21,39 @@ def parse_bib_file_for_journals(bib_file_path):
     # Extract journal names
     journals = set()  # Use a set to ensure unique journals per file
     for entry in bib_database.entries:
+        if dedup_index is not None and dedup_index.is_duplicate(entry, os.path.basename(bib_file_path)):
+            continue
         if 'journal' in entry:
             journals.add(entry['journal'])
     
     return journals
 
-def process_bib_files_for_connections(directory_path):
+def process_bib_files_for_connections(directory_path, dedup_index=None, memory_budget=None):
     """
     Process all .bib files in the specified directory and record connections between journals.
+    If a dedup index is given, each paper is only counted in the first file it appears in.
+    If a memory budget (in bytes) is given, connections are counted with an external sort
+    that spills to temporary files instead of in memory.
     """
-    journal_connections = defaultdict(int)
+    journal_connections = Counter() if memory_budget is None else ExternalPairCounter(memory_budget)
     unique_journals = set()
     
-    # Iterate over all files in the specified directory
-    for filename in os.listdir(directory_path):
+    # Iterate over all files in the specified directory, in a fixed order so that
+    # with a dedup index the same file always keeps a shared paper
+    for filename in sorted(os.listdir(directory_path)):
         if filename.endswith('.bib'):
             file_path = os.path.join(directory_path, filename)
             print(f"Processing file: {file_path}")
             
             # Parse the .bib file and get the set of journals
-            journals = parse_bib_file_for_journals(file_path)
+            journals = parse_bib_file_for_journals(file_path, dedup_index)
             
             # Add journals to the unique journal set
             unique_journals.update(journals)
             
-            # Find all pairs of journals in the same .bib file
-            for journal1, journal2 in combinations(journals, 2):
-                # Sort the journals alphabetically to avoid duplicate pairs in different order
-                journal_pair = tuple(sorted([journal1, journal2]))
-                # Add 1 to their connection strength
-                journal_connections[journal_pair] += 1
+            # Find all pairs of journals in the same .bib file and add 1 to their connection strength
+            # Sort the journals alphabetically to avoid duplicate pairs in different order
+            journal_connections.update(combinations(sorted(journals), 2))
     
     return unique_journals, journal_connections
 
@@ -70,11 +78,19 @@ def save_for_vosviewer(journals, journal_connections):
             edges_file.write(f"{source},{target},{strength}\n")
 
 if __name__ == "__main__":
+    import sys
+
     # Specify the directory containing the .bib files
     bib_directory = 'data/bib'
+
+    # Skip papers already counted from another author's file only when asked to
+    dedup_index = DedupIndex() if '--dedupe' in sys.argv else None
     
     # Step 1: Process all .bib files and compute the journal connections
-    unique_journals, journal_connections = process_bib_files_for_connections(bib_directory)
+    memory_budget = parse_memory_budget(sys.argv)
+    unique_journals, journal_connections = process_bib_files_for_connections(bib_directory, dedup_index, memory_budget)
+    if dedup_index is not None:
+        dedup_index.report()
     
     # Step 2: Save the data in a format required by VOSViewer
     save_for_vosviewer(unique_journals, journal_connections)
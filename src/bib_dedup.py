@@ -0,0 +1,192 @@
+import re
+import hashlib
+from array import array
+from collections import Counter
+
+# Prefixes removed from DOIs, which are sometimes given as URLs
+DOI_PREFIXES = ('https://doi.org/', 'http://doi.org/', 'http://dx.doi.org/', 'doi:')
+
+
+def normalize_doi(doi):
+    doi = doi.strip().lower()
+    for prefix in DOI_PREFIXES:
+        if doi.startswith(prefix):
+            doi = doi[len(prefix):]
+    return doi
+
+
+def normalize_title(title):
+    """
+    Lowercase a title and keep only its letters and digits, so LaTeX braces,
+    punctuation and line breaks do not affect matching.
+    """
+    title = re.sub(r"\\[`'\"^~=.uvHckr]", '', title)
+    return re.sub(r'[\W_]+', '', title.lower())
+
+
+def hash_key(key):
+    """
+    Hash a string key to a non-zero 64-bit integer.
+    """
+    fingerprint = int.from_bytes(hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest(), 'little')
+    return fingerprint or 1
+
+
+def entry_fingerprints(entry):
+    """
+    Fingerprint a .bib entry by its DOI and by its normalised title and year.
+    Returns (DOI fingerprint, title fingerprint), with None for a key the entry does not have.
+    """
+    doi = normalize_doi(entry.get('doi', ''))
+    doi_fingerprint = hash_key('doi:' + doi) if doi else None
+
+    title = normalize_title(entry.get('title', ''))
+    title_fingerprint = hash_key(f"title:{title}|{entry.get('year', '').strip()}") if title else None
+
+    return doi_fingerprint, title_fingerprint
+
+
+class FingerprintSet:
+    """
+    Open-addressing hash set of 64-bit fingerprints stored in a flat array,
+    using 8 bytes per slot instead of a Python int object per member.
+    """
+
+    def __init__(self, capacity=1024):
+        self.slots = array('Q', bytes(8 * capacity))
+        self.size = 0
+
+    def find_slot(self, fingerprint):
+        """
+        Return the slot holding a fingerprint, or the empty slot where it would go.
+        """
+        mask = len(self.slots) - 1
+        slot = fingerprint & mask
+        while self.slots[slot] and self.slots[slot] != fingerprint:
+            slot = (slot + 1) & mask
+        return slot
+
+    def add(self, fingerprint):
+        """
+        Add a fingerprint. Returns False if it was already in the set.
+        """
+        slot = self.find_slot(fingerprint)
+        if self.slots[slot]:
+            return False
+
+        self.slots[slot] = fingerprint
+        self.size += 1
+        if 2 * self.size > len(self.slots):
+            self.grow()
+        return True
+
+    def grow(self):
+        old_slots = self.slots
+        self.slots = array('Q', bytes(16 * len(old_slots)))
+        self.size = 0
+        for fingerprint in old_slots:
+            if fingerprint:
+                self.add(fingerprint)
+
+    def __len__(self):
+        return self.size
+
+
+class FingerprintMap(FingerprintSet):
+    """
+    FingerprintSet that also stores a 64-bit value with each fingerprint, in a parallel array.
+    """
+
+    def __init__(self, capacity=1024):
+        super().__init__(capacity)
+        self.values = array('Q', bytes(8 * capacity))
+
+    def get(self, fingerprint):
+        """
+        Return the value stored with a fingerprint, or None if it is not in the map.
+        """
+        slot = self.find_slot(fingerprint)
+        return self.values[slot] if self.slots[slot] else None
+
+    def set(self, fingerprint, value):
+        slot = self.find_slot(fingerprint)
+        if not self.slots[slot]:
+            self.slots[slot] = fingerprint
+            self.size += 1
+        self.values[slot] = value
+        if 2 * self.size > len(self.slots):
+            self.grow()
+
+    def grow(self):
+        old_slots, old_values = self.slots, self.values
+        self.slots = array('Q', bytes(16 * len(old_slots)))
+        self.values = array('Q', bytes(16 * len(old_values)))
+        self.size = 0
+        for fingerprint, value in zip(old_slots, old_values):
+            if fingerprint:
+                self.set(fingerprint, value)
+
+
+# Title owner value of a title only seen on entries without a DOI (DOI fingerprints are never 0)
+NO_DOI = 0
+
+
+class DedupIndex:
+    """
+    Recognises .bib entries already seen in an earlier file, in a single pass over the files.
+    """
+
+    def __init__(self):
+        self.dois = FingerprintSet()
+        # Title and year fingerprint -> DOI fingerprint of the entry it belongs to, or NO_DOI
+        self.title_owners = FingerprintMap()
+        self.stats = Counter()
+        self.duplicates_by_file = Counter()
+
+    def is_duplicate(self, entry, source=None):
+        """
+        Record an entry and return True if an entry with the same DOI was seen before, or
+        an entry with the same title and year where at least one of the two has no DOI.
+        Two entries with the same title and year but different DOIs are different papers
+        (e.g. recurring columns or reused titles).
+        Entries with neither a DOI nor a title are never treated as duplicates.
+        """
+        self.stats['Entries'] += 1
+        doi_fingerprint, title_fingerprint = entry_fingerprints(entry)
+        if doi_fingerprint is None and title_fingerprint is None:
+            self.stats['Entries without DOI or title'] += 1
+            return False
+
+        kind = None
+        if doi_fingerprint is not None and not self.dois.add(doi_fingerprint):
+            kind = 'doi'
+
+        if title_fingerprint is not None:
+            owner = self.title_owners.get(title_fingerprint)
+            if owner is None:
+                self.title_owners.set(title_fingerprint, doi_fingerprint or NO_DOI)
+            elif owner == NO_DOI or doi_fingerprint is None:
+                kind = kind or 'title'
+                # The copy without a DOI now belongs to this DOI, so other DOIs with the title stay separate
+                if owner == NO_DOI and doi_fingerprint is not None:
+                    self.title_owners.set(title_fingerprint, doi_fingerprint)
+
+        if kind is None:
+            return False
+
+        self.stats['Duplicates'] += 1
+        self.stats[f'Duplicates by {kind}'] += 1
+        if source is not None:
+            self.duplicates_by_file[source] += 1
+        return True
+
+    def report(self):
+        """
+        Print the duplicate statistics of the run.
+        """
+        print(f"Entries: {self.stats['Entries']}")
+        print(f"Unique entries: {self.stats['Entries'] - self.stats['Duplicates']}")
+        for name in ('Duplicates', 'Duplicates by doi', 'Duplicates by title', 'Entries without DOI or title'):
+            print(f"{name}: {self.stats[name]}")
+        for source, count in self.duplicates_by_file.most_common():
+            print(f"  {source}: {count} duplicates")
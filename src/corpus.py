@@ -0,0 +1,104 @@
+import os
+import sys
+import json
+from collections import Counter, deque
+
+CORPUS_ROOT = 'data/corpus'
+
+# IEEE Xplore publication numbers of the journals we scrape
+JOURNALS = {
+    'TAFFC': 5165369,
+}
+
+
+def partition_path(corpus_root, journal, year):
+    """
+    Return the path of the partition holding one journal's papers for one year.
+    """
+    return os.path.join(corpus_root, journal, f"{year}.json")
+
+
+def write_partitions(records, journal, corpus_root=CORPUS_ROOT):
+    """
+    Split a journal's records by year and save each year to its own partition file.
+    """
+    by_year = {}
+    for record in records:
+        by_year.setdefault(record["Year"], []).append(dict(record, Journal=journal))
+
+    os.makedirs(os.path.join(corpus_root, journal), exist_ok=True)
+    for year, year_records in by_year.items():
+        with open(partition_path(corpus_root, journal, year), 'w') as file:
+            json.dump(year_records, file, indent=4)
+
+
+def list_partitions(corpus_root=CORPUS_ROOT, journals=None):
+    """
+    List the (journal, year, path) partitions in the corpus, optionally restricted to some journals.
+    """
+    partitions = []
+    for journal in sorted(os.listdir(corpus_root)):
+        journal_dir = os.path.join(corpus_root, journal)
+        if not os.path.isdir(journal_dir) or (journals is not None and journal not in journals):
+            continue
+        for filename in sorted(os.listdir(journal_dir)):
+            if filename.endswith('.json'):
+                year = int(filename[:-len('.json')])
+                partitions.append((journal, year, os.path.join(journal_dir, filename)))
+    return partitions
+
+
+def require_corpus(corpus_root=CORPUS_ROOT):
+    """
+    Exit with a hint if the partitioned corpus has not been created yet.
+    """
+    if not os.path.isdir(corpus_root):
+        sys.exit(f"No corpus found at {corpus_root}. Run \"python src/corpus.py\" first to create it.")
+
+
+def load_partition(path):
+    with open(path, 'r') as file:
+        return json.load(file)
+
+
+def map_partitions(partitions, count_partition, workers=None):
+    """
+    Run count_partition on every partition in parallel and yield the results in order.
+    count_partition must be a module-level function so it can be sent to the worker processes.
+    Only a few partitions are in flight at a time, so finished results do not pile up
+    in memory while the caller consumes them.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    max_in_flight = 2 * (workers or os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = deque()
+        for partition in partitions:
+            futures.append(executor.submit(count_partition, partition))
+            if len(futures) >= max_in_flight:
+                yield futures.popleft().result()
+        while futures:
+            yield futures.popleft().result()
+
+
+def aggregate_partitions(partitions, count_partition, workers=None):
+    """
+    Run count_partition on every partition in parallel and merge the returned tuples of Counters.
+    Returns None if there are no partitions.
+    """
+    merged = None
+    for counters in map_partitions(partitions, count_partition, workers):
+        if merged is None:
+            merged = tuple(Counter() for _ in counters)
+        for total, counter in zip(merged, counters):
+            total.update(counter)
+    return merged
+
+
+if __name__ == "__main__":
+    # Move the existing single-journal output into the partitioned layout
+    json_file = 'data/TAFFC_IEEEkeywords.json'
+
+    write_partitions(load_partition(json_file), 'TAFFC')
+
+    print(f"Corpus partitions written to {CORPUS_ROOT}.")
@@ -0,0 +1,172 @@
+import os
+import sys
+import heapq
+import struct
+import tempfile
+from array import array
+
+# Rough cost of one buffered pair: 16 bytes in the key and weight arrays, plus the
+# tuple and number objects created while the buffer is sorted
+BYTES_PER_BUFFERED_PAIR = 128
+
+# Maximum number of runs merged at once, to stay below the open file limit
+MAX_FAN_IN = 64
+
+# Number of (pair, weight) records read from or written to a run file at a time
+READ_BLOCK = 8192
+
+# A run record: the packed pair and its summed weight
+RECORD = struct.Struct('<Qd')
+
+
+class ExternalPairCounter:
+    """
+    Counts pairs of labels in bounded memory, in place of a Counter of pairs:
+    update() counts pairs like Counter.update, add() adds a weighted pair, and
+    items() yields the totals. items() can be called again, also after more updates.
+    Call close() (or use the counter as a context manager) to remove the temporary files.
+
+    Labels are interned to integer ids and each pair is packed into one 64-bit int.
+    Packed pairs and their weights are buffered in fixed-size arrays; when the buffer
+    is full it is sorted and written to a temporary file as a run of (pair, weight)
+    records, and items() k-way merges the runs, yielding pairs in packed pair order.
+    """
+
+    def __init__(self, memory_budget, tmp_dir=None):
+        self.capacity = max(1024, memory_budget // BYTES_PER_BUFFERED_PAIR)
+        self.keys = array('Q')
+        self.weights = array('d')
+        self.label_ids = {}
+        self.labels = []
+        self.tmp_dir = tempfile.TemporaryDirectory(dir=tmp_dir, prefix='pair_runs_')
+        self.runs = []
+        self.run_count = 0
+        # Totals are yielded as ints until a fractional weight is added
+        self.integral = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.runs = []
+        self.tmp_dir.cleanup()
+
+    def intern(self, label):
+        label_id = self.label_ids.get(label)
+        if label_id is None:
+            label_id = self.label_ids[label] = len(self.labels)
+            self.labels.append(label)
+        return label_id
+
+    def add(self, label1, label2, weight=1):
+        """
+        Add weight to the count of the (label1, label2) pair.
+        """
+        self.keys.append(self.intern(label1) << 32 | self.intern(label2))
+        self.weights.append(weight)
+        if self.integral and weight != int(weight):
+            self.integral = False
+        if len(self.keys) >= self.capacity:
+            self.flush()
+
+    def update(self, pairs):
+        """
+        Count each (label1, label2) pair of an iterable once, like Counter.update.
+        """
+        for label1, label2 in pairs:
+            self.add(label1, label2)
+
+    def flush(self):
+        """
+        Sort the buffer and write it to a new run file as (pair, weight) records.
+        """
+        if not self.keys:
+            return
+        records = sorted(zip(self.keys, self.weights))
+        self.keys = array('Q')
+        self.weights = array('d')
+        self.runs.append(self.write_run(aggregate_sorted(records)))
+
+    def write_run(self, records):
+        path = os.path.join(self.tmp_dir.name, f"run_{self.run_count}.bin")
+        self.run_count += 1
+        block = []
+        with open(path, 'wb') as file:
+            for record in records:
+                block.append(RECORD.pack(*record))
+                if len(block) >= READ_BLOCK:
+                    file.write(b''.join(block))
+                    block = []
+            file.write(b''.join(block))
+        return path
+
+    def merge_runs(self, paths):
+        return aggregate_sorted(heapq.merge(*(read_run(path) for path in paths)))
+
+    def merge_into_run(self, paths):
+        path = self.write_run(self.merge_runs(paths))
+        for merged_path in paths:
+            os.remove(merged_path)
+        return path
+
+    def items(self):
+        """
+        Yield ((label1, label2), count) for every distinct pair.
+        """
+        self.flush()
+
+        # Merge in several passes if there are too many runs to open at once
+        while len(self.runs) > MAX_FAN_IN:
+            groups = [self.runs[i:i + MAX_FAN_IN] for i in range(0, len(self.runs), MAX_FAN_IN)]
+            self.runs = [self.merge_into_run(group) for group in groups]
+
+        for key, weight in self.merge_runs(self.runs):
+            count = int(weight) if self.integral else weight
+            yield (self.labels[key >> 32], self.labels[key & 0xFFFFFFFF]), count
+
+
+def aggregate_sorted(records):
+    """
+    Sum the weights of consecutive records with the same key in a key-sorted stream.
+    """
+    current_key, current_weight = None, 0
+    for key, weight in records:
+        if key == current_key:
+            current_weight += weight
+            continue
+        if current_key is not None:
+            yield current_key, current_weight
+        current_key, current_weight = key, weight
+    if current_key is not None:
+        yield current_key, current_weight
+
+
+def read_run(path):
+    """
+    Yield the (pair, weight) records of a run file, reading it in blocks.
+    """
+    with open(path, 'rb') as file:
+        while True:
+            block = file.read(RECORD.size * READ_BLOCK)
+            if not block:
+                return
+            yield from RECORD.iter_unpack(block)
+
+
+def parse_memory_budget(argv):
+    """
+    Read "--memory-budget <MB>" from the command line arguments, in bytes, or None if absent.
+    Exits with a usage message if the value is missing or not a positive whole number.
+    """
+    if '--memory-budget' not in argv:
+        return None
+    try:
+        megabytes = int(argv[argv.index('--memory-budget') + 1])
+    except (IndexError, ValueError):
+        megabytes = 0
+    if megabytes <= 0:
+        sys.exit("usage: --memory-budget <MB> expects a positive whole number of megabytes, e.g. --memory-budget 256")
+    return megabytes * 2**20
@@ -0,0 +1,76 @@
+import os
+import sys
+import subprocess
+
+# Heavy dependencies that must only be loaded by the code paths that use them
+HEAVY_MODULES = ['pandas', 'numpy', 'plotly', 'selenium', 'webdriver_manager', 'bibtexparser', 'multiprocessing']
+
+# Pipeline modules and their import time budget in milliseconds. The budgets leave a wide
+# margin over local timings (about 10-40 ms, 80 ms for the server) so slower hosts pass,
+# while importing pandas or plotly at module level would still go over
+IMPORT_BUDGETS_MS = {
+    'info_extraction': 250,
+    'keyword_extraction': 250,
+    'keyword_canonicalization': 250,
+    'keyword_network': 250,
+    'keyword_query': 250,
+    'corpus': 250,
+    'bib_dedup': 250,
+    'external_counter': 250,
+    'sketches': 250,
+    'author_publications': 250,
+    'author_network': 250,
+    'plot_by_issue': 250,
+    'plot_by_ratio': 250,
+    'plot_by_year': 250,
+    'trend_server': 500,
+}
+
+SRC_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+
+
+def measure_import(module):
+    """
+    Import a module in a fresh interpreter with "python -X importtime".
+    Returns its cumulative import time in milliseconds and the heavy modules it loaded.
+    """
+    code = (
+        f"import sys; import {module}; "
+        f"print(','.join(name for name in {HEAVY_MODULES!r} if name in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=SRC_DIRECTORY, capture_output=True, text=True, check=True,
+    )
+
+    # Lines look like "import time:  self [us] | cumulative | imported package"
+    cumulative_us = 0
+    for line in result.stderr.splitlines():
+        fields = line.split('|')
+        if len(fields) == 3 and fields[2].rstrip() == f" {module}":
+            cumulative_us = int(fields[1])
+
+    heavy_loaded = [name for name in result.stdout.strip().split(',') if name]
+    return cumulative_us / 1000, heavy_loaded
+
+
+def check_import_times(budgets=IMPORT_BUDGETS_MS):
+    """
+    Measure every module against its budget and return the list of failures.
+    """
+    failures = []
+    for module, budget_ms in budgets.items():
+        import_ms, heavy_loaded = measure_import(module)
+        print(f"{module}: {import_ms:.1f} ms (budget {budget_ms} ms)")
+        if import_ms > budget_ms:
+            failures.append(f"{module} took {import_ms:.1f} ms to import, budget is {budget_ms} ms")
+        if heavy_loaded:
+            failures.append(f"{module} loads {', '.join(heavy_loaded)} at import time")
+    return failures
+
+
+if __name__ == "__main__":
+    failures = check_import_times()
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
@@ -1,8 +1,11 @@
 import json
-import pandas as pd
 from collections import Counter
+from functools import partial
 
-def calculate_frequency_by_issue(json_file):
+from corpus import CORPUS_ROOT, require_corpus, list_partitions, load_partition, aggregate_partitions
+from keyword_canonicalization import canonicalize_keywords, load_or_build_canonical_index, load_or_build_corpus_canonical_index
+
+def calculate_frequency_by_issue(json_file, canonical_index=None):
     with open(json_file, 'r') as file:
         data = json.load(file)
     
@@ -12,6 +15,8 @@ def calculate_frequency_by_issue(json_file):
         year = entry.get("Year", "")
         issue = entry.get("Issue #", "")
         keywords = entry.get("IEEE Keywords", [])
+        if canonical_index is not None:
+            keywords = canonicalize_keywords(keywords, canonical_index)
         records.append((year, issue, keywords))
     
     # Count the frequency of each keyword
@@ -42,7 +47,7 @@ def calculate_frequency_by_issue(json_file):
 
 
 # calculate by year
-def calculate_frequency_by_year(json_file):
+def calculate_frequency_by_year(json_file, canonical_index=None):
     with open(json_file, 'r') as file:
         data = json.load(file)
     
@@ -52,6 +57,8 @@ def calculate_frequency_by_year(json_file):
         year = entry.get("Year", "")
         if year <= 2023:
             keywords = entry.get("IEEE Keywords", [])
+            if canonical_index is not None:
+                keywords = canonicalize_keywords(keywords, canonical_index)
             records.append((year, keywords))
     
     # Count the frequency of each keyword
@@ -79,20 +86,119 @@ def calculate_frequency_by_year(json_file):
     return frequency_data
 
 
+# calculate across journals from the partitioned corpus
+def count_partition_keywords(partition, canonical_index=None):
+    """
+    Count the keywords of one (journal, year) partition.
+    Runs in a worker process, so it only returns Counters to be merged.
+    """
+    journal, year, path = partition
+
+    issue_keyword_count = Counter()
+    issue_count = Counter()
+    year_keyword_count = Counter()
+
+    for entry in load_partition(path):
+        issue = entry.get("Issue #", "")
+        keywords = entry.get("IEEE Keywords", [])
+        if canonical_index is not None:
+            keywords = canonicalize_keywords(keywords, canonical_index)
+
+        issue_count[(journal, year, issue)] += 1
+        year_keyword_count[(journal, year)] += len(keywords)
+        for keyword in keywords:
+            issue_keyword_count[(journal, year, issue, keyword)] += 1
+
+    return issue_keyword_count, issue_count, year_keyword_count
+
+
+def count_corpus_keywords(corpus_root=CORPUS_ROOT, journals=None, canonical_index=None, workers=None):
+    """
+    Count the keywords of every partition in parallel and merge the counts.
+    """
+    partitions = list_partitions(corpus_root, journals)
+    counters = aggregate_partitions(partitions, partial(count_partition_keywords, canonical_index=canonical_index), workers)
+    return counters or (Counter(), Counter(), Counter())
+
+
+def calculate_frequency_by_journal_issue(corpus_counts):
+    issue_keyword_count, issue_count, _ = corpus_counts
+
+    frequency_data = []
+    for (journal, year, issue, keyword), frequency in issue_keyword_count.items():
+        ratio = (frequency / issue_count[(journal, year, issue)]) * 100
+        ratio = round(ratio, 4)
+        frequency_data.append({
+            "Journal": journal,
+            "Year": year,
+            "Issue": issue,
+            "Keyword": keyword,
+            "Frequency": frequency,
+            "Ratio": ratio
+        })
+
+    return frequency_data
+
+
+def calculate_frequency_by_journal_year(corpus_counts, last_year=2023):
+    issue_keyword_count, _, year_keyword_count = corpus_counts
+
+    # Sum the issue counts up to years
+    keyword_counter = Counter()
+    for (journal, year, issue, keyword), frequency in issue_keyword_count.items():
+        if year <= last_year:
+            keyword_counter[(journal, year, keyword)] += frequency
+
+    frequency_data = []
+    for (journal, year, keyword), frequency in keyword_counter.items():
+        ratio = (frequency / year_keyword_count[(journal, year)]) * 100
+        ratio = round(ratio, 4)
+        frequency_data.append({
+            "Journal": journal,
+            "Year": year,
+            "Keyword": keyword,
+            "Frequency": frequency,
+            "Ratio": ratio
+        })
+
+    return frequency_data
+
+
 def save_to_csv(frequency_data, output_csv_file):
+    # pandas is only needed here, so it is imported lazily to keep the counting stages fast to start
+    import pandas as pd
+
     df = pd.DataFrame(frequency_data)
     df.to_csv(output_csv_file, index=False)
 
 
 
 if __name__ == "__main__":
+    import sys
+
     json_file = 'data/TAFFC_IEEEkeywords.json'
     output_csv_file_issue = 'data/TAFFC_keywords_by_issue.csv'
     output_csv_file_year = 'data/TAFFC_keywords_by_year.csv'
 
-    frequency_data_issue = calculate_frequency_by_issue(json_file)
-    frequency_data_year = calculate_frequency_by_year(json_file)
-    save_to_csv(frequency_data_issue, output_csv_file_issue)
-    save_to_csv(frequency_data_year, output_csv_file_year)
+    if '--corpus' in sys.argv:
+        require_corpus(CORPUS_ROOT)
+
+    # Merge keyword variants only when asked to, so the default output is unchanged
+    canonical_index = None
+    if '--canonical' in sys.argv and '--corpus' in sys.argv:
+        canonical_index = load_or_build_corpus_canonical_index(CORPUS_ROOT)
+    elif '--canonical' in sys.argv:
+        canonical_index = load_or_build_canonical_index(json_file)
+
+    if '--corpus' in sys.argv:
+        # Compare all journals in the partitioned corpus
+        corpus_counts = count_corpus_keywords(CORPUS_ROOT, canonical_index=canonical_index)
+        save_to_csv(calculate_frequency_by_journal_issue(corpus_counts), 'data/keywords_by_journal_issue.csv')
+        save_to_csv(calculate_frequency_by_journal_year(corpus_counts), 'data/keywords_by_journal_year.csv')
+    else:
+        frequency_data_issue = calculate_frequency_by_issue(json_file, canonical_index)
+        frequency_data_year = calculate_frequency_by_year(json_file, canonical_index)
+        save_to_csv(frequency_data_issue, output_csv_file_issue)
+        save_to_csv(frequency_data_year, output_csv_file_year)
 
     print("Keyword frequency data has been saved")
@@ -0,0 +1,230 @@
+import os
+import re
+import csv
+import json
+import hashlib
+import itertools
+from collections import Counter, defaultdict
+
+from corpus import CORPUS_ROOT, list_partitions, load_partition
+
+INDEX_CACHE_PATH = 'data/keyword_canonical_index.json'
+SYNONYMS_PATH = 'data/keyword_synonyms.csv'
+
+# Word endings that look plural but are not (e.g. "Analysis", "Status", "Access")
+NON_PLURAL_ENDINGS = ('ss', 'is', 'us', 'ics')
+
+# Version of the folding rules (fold_keyword, lemmatize_word, NON_PLURAL_ENDINGS).
+# Increase it whenever the rules change, so cached indexes built with the old rules are rebuilt
+FOLDING_RULES_VERSION = 1
+
+
+def lemmatize_word(word):
+    """
+    Reduce a plural English noun to its singular form with a few suffix rules.
+    """
+    if len(word) <= 3 or word.endswith(NON_PLURAL_ENDINGS):
+        return word
+    if word.endswith('ies'):
+        return word[:-3] + 'y'
+    if word.endswith(('sses', 'xes', 'ches', 'shes')):
+        return word[:-2]
+    if word.endswith('s'):
+        return word[:-1]
+    return word
+
+
+def fold_keyword(keyword):
+    """
+    Fold a keyword to its matching key: lowercase, hyphens and runs of whitespace
+    collapsed to a single space, and the head noun (last word) singularised.
+    """
+    words = re.sub(r'[\s\-_]+', ' ', keyword.lower()).strip().split(' ')
+    words[-1] = lemmatize_word(words[-1])
+    return ' '.join(words)
+
+
+def load_synonyms(synonyms_file=SYNONYMS_PATH):
+    """
+    Load the user-supplied synonym table, a CSV file with "Variant,Canonical" rows.
+    Returns an empty table if the file does not exist.
+    """
+    synonyms = {}
+    if not os.path.exists(synonyms_file):
+        return synonyms
+
+    with open(synonyms_file, 'r', newline='') as file:
+        for row in csv.DictReader(file):
+            synonyms[row['Variant'].strip()] = row['Canonical'].strip()
+
+    return synonyms
+
+
+def build_canonical_index(keyword_counter, synonyms=None):
+    """
+    Build the variant -> canonical keyword index.
+    Keywords with the same folded key form one group, and synonym rows merge whole groups.
+    The canonical label of a group is the synonym target if one is given, otherwise
+    its most frequent spelling.
+    """
+    synonyms = synonyms or {}
+
+    # Group the spellings by folded key
+    groups = defaultdict(list)
+    for keyword in keyword_counter:
+        groups[fold_keyword(keyword)].append(keyword)
+
+    # Redirect folded keys through the synonym table
+    key_labels = {}
+    for variant, canonical in synonyms.items():
+        variant_key = fold_keyword(variant)
+        canonical_key = fold_keyword(canonical)
+        if variant_key != canonical_key:
+            spellings = groups.pop(variant_key, [])
+            groups[canonical_key].extend(spellings)
+        key_labels[canonical_key] = canonical
+
+    index = {}
+    for key, spellings in groups.items():
+        if not spellings:
+            continue
+        label = key_labels.get(key)
+        if label is None:
+            label = min(spellings, key=lambda keyword: (-keyword_counter[keyword], keyword))
+        for keyword in spellings:
+            index[keyword] = label
+
+    return index
+
+
+def canonicalize_keywords(keywords, canonical_index):
+    """
+    Map a paper's keywords to their canonical labels, dropping duplicates created
+    by the merge while keeping the original order.
+    """
+    canonical_keywords = []
+    seen = set()
+    for keyword in keywords:
+        canonical = canonical_index.get(keyword, keyword)
+        if canonical not in seen:
+            seen.add(canonical)
+            canonical_keywords.append(canonical)
+    return canonical_keywords
+
+
+def file_signature(path):
+    """
+    Identify a version of a file by its path, modification time and size, without reading it.
+    """
+    stat = os.stat(path)
+    return [os.path.abspath(path), stat.st_mtime_ns, stat.st_size]
+
+
+def compute_cache_key(input_paths, synonyms_file):
+    """
+    Key the cached index by the signatures of its input files, the contents of the
+    synonym table and the version of the folding rules, so a stale cache can be
+    detected without counting the keywords again.
+    """
+    synonyms_hash = None
+    if os.path.exists(synonyms_file):
+        with open(synonyms_file, 'rb') as file:
+            synonyms_hash = hashlib.sha1(file.read()).hexdigest()
+
+    payload = json.dumps([FOLDING_RULES_VERSION, [file_signature(path) for path in input_paths], synonyms_hash])
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def count_keywords(json_files):
+    """
+    Count the IEEE keywords of every paper in the given JSON files.
+    """
+    keyword_counter = Counter()
+    for json_file in json_files:
+        for entry in load_partition(json_file):
+            keyword_counter.update(entry.get("IEEE Keywords", []))
+    return keyword_counter
+
+
+def load_or_build_canonical_index(json_file, synonyms_file=SYNONYMS_PATH, cache_path=INDEX_CACHE_PATH):
+    """
+    Return the canonical index for the keywords in json_file, reading it from the
+    on-disk cache when the file, synonyms and folding rules are unchanged, and rebuilding it otherwise.
+    """
+    return load_or_build_index([json_file], synonyms_file, cache_path)
+
+
+def load_or_build_corpus_canonical_index(corpus_root=CORPUS_ROOT, journals=None,
+                                         synonyms_file=SYNONYMS_PATH, cache_path=INDEX_CACHE_PATH):
+    """
+    Return the canonical index for the keywords of every journal in the partitioned corpus.
+    """
+    paths = [path for _, _, path in list_partitions(corpus_root, journals)]
+    return load_or_build_index(paths, synonyms_file, cache_path)
+
+
+def load_or_build_index(json_files, synonyms_file=SYNONYMS_PATH, cache_path=INDEX_CACHE_PATH):
+    """
+    Return the canonical index for the keywords of the given JSON files, from the cache if
+    its key matches. The files are only read when the index has to be rebuilt.
+    """
+    cache_key = compute_cache_key(json_files, synonyms_file)
+
+    if os.path.exists(cache_path):
+        with open(cache_path, 'r') as file:
+            cache = json.load(file)
+        if cache.get("key") == cache_key:
+            return cache["index"]
+
+    index = build_canonical_index(count_keywords(json_files), load_synonyms(synonyms_file))
+    with open(cache_path, 'w') as file:
+        json.dump({"key": cache_key, "index": index}, file, indent=4)
+
+    return index
+
+
+def count_graph_size(papers_keywords):
+    """
+    Count the nodes and edges of the keyword co-occurrence graph.
+    """
+    nodes = set()
+    edges = set()
+    for keywords in papers_keywords:
+        keywords = set(keywords)
+        nodes.update(keywords)
+        edges.update(itertools.combinations(sorted(keywords), 2))
+    return len(nodes), len(edges)
+
+
+def merge_report(papers_keywords, canonical_index):
+    """
+    Report how many co-occurrence graph nodes and edges the merge removed.
+    """
+    nodes_before, edges_before = count_graph_size(papers_keywords)
+    nodes_after, edges_after = count_graph_size(
+        canonicalize_keywords(keywords, canonical_index) for keywords in papers_keywords
+    )
+    return {
+        "Nodes before": nodes_before,
+        "Nodes after": nodes_after,
+        "Nodes removed": nodes_before - nodes_after,
+        "Edges before": edges_before,
+        "Edges after": edges_after,
+        "Edges removed": edges_before - edges_after,
+    }
+
+
+if __name__ == "__main__":
+    json_file = 'data/TAFFC_IEEEkeywords.json'
+
+    canonical_index = load_or_build_canonical_index(json_file)
+
+    with open(json_file, 'r') as file:
+        papers_keywords = [entry.get("IEEE Keywords", []) for entry in json.load(file)]
+
+    for keyword, canonical in sorted(canonical_index.items()):
+        if keyword != canonical:
+            print(f"{keyword} -> {canonical}")
+
+    for name, value in merge_report(papers_keywords, canonical_index).items():
+        print(f"{name}: {value}")
@@ -1,26 +1,38 @@
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
+# Selenium is imported where it is used, since importing it is slow
 import time
 import re
+import sys
 import json
 
+from corpus import JOURNALS, write_partitions
+
 
 # get past years of TAFFC issues
 def get_all_years():
+    from selenium.webdriver.common.by import By
+
     year_elements = driver.find_elements(By.CSS_SELECTOR, 'div.issue-details-past-tabs.year ul li a')
     years = [elem.text for elem in year_elements]
     return years
 
 
-# obtain all issues url from all past issues of TAFFC
+# check whether a year tab is the one currently shown (the latest year, on page load)
+def is_selected_tab(tab):
+    from selenium.webdriver.common.by import By
+
+    tab_item = tab.find_element(By.XPATH, './..')
+    classes = f"{tab.get_attribute('class') or ''} {tab_item.get_attribute('class') or ''}".split()
+    return 'active' in classes or tab.get_attribute('aria-selected') == 'true'
+
+
+# obtain all issues url from all past issues of the journal
 def get_issue_urls_for_year(base_url, year):
+    from selenium.webdriver.common.by import By
+
     driver.get(base_url)
     time.sleep(2)
     year_tab = driver.find_element(By.XPATH, f"//a[text()='{year}']")
-    if year != 2024: year_tab.click()
+    if not is_selected_tab(year_tab): year_tab.click()
     time.sleep(2)  # Wait for the dynamic content to load
     issue_elements = driver.find_elements(By.CSS_SELECTOR, 'a[href*="tocresult.jsp?isnumber="][href*="&punumber="]')
     issues = [(elem.text.strip(), elem.get_attribute('href')) for elem in issue_elements]
@@ -29,6 +41,8 @@ def get_issue_urls_for_year(base_url, year):
 
 # obtain all paper urls from the issue
 def get_paper_urls(issue_url):
+    from selenium.webdriver.common.by import By
+
     driver.get(issue_url)
     time.sleep(2)  # Wait for the dynamic content to load
     paper_urls = set()
@@ -55,6 +69,8 @@ def get_paper_urls(issue_url):
 
 # extract the IEEE keywords & title from a paper URL
 def extract_IEEEkeywords_and_title(paper_url):
+    from selenium.webdriver.common.by import By
+
     driver.get(paper_url)
     time.sleep(1.5)  # Wait for the dynamic content to load
     
@@ -83,9 +99,12 @@ def extract_IEEEkeywords_and_title(paper_url):
 
 
 
-def main():
-    base_url = 'https://ieeexplore.ieee.org/xpl/issues?punumber=5165369&isnumber=10542474'
+def main(journal, punumber):
+    base_url = f'https://ieeexplore.ieee.org/xpl/issues?punumber={punumber}'
 
+    # Open the journal's issues page first, the driver may still be on the previous journal's pages
+    driver.get(base_url)
+    time.sleep(2)
     years = get_all_years()
     all_data = []
 
@@ -109,19 +128,34 @@ def main():
 
     # Convert to JSON string and save to file
     json_data = json.dumps(all_data, indent=4)
-    with open('taffc_IEEEkeywords.json', 'w') as json_file:
+    with open(f'{journal.lower()}_IEEEkeywords.json', 'w') as json_file:
         json_file.write(json_data)
 
+    # Also save the papers into the per-journal, per-year corpus partitions
+    write_partitions(all_data, journal)
+
 
 if __name__ == "__main__":
+    # Scrape the journals given on the command line, or all known journals
+    journals = sys.argv[1:] or list(JOURNALS)
+    unknown_journals = [journal for journal in journals if journal not in JOURNALS]
+    if unknown_journals:
+        sys.exit(f"Unknown journal(s): {', '.join(unknown_journals)}. Known journals: {', '.join(JOURNALS)}")
+
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+    from selenium.webdriver.chrome.options import Options
+    from webdriver_manager.chrome import ChromeDriverManager
+
     # Setup Selenium WebDriver
     chrome_options = Options()
     chrome_options.add_argument("--headless")  # Run in headless mode
     chrome_options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36")
 
     driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=chrome_options)
-    
+
     try:
-        main()
+        for journal in journals:
+            main(journal, JOURNALS[journal])
     finally:
         driver.quit()
@@ -1,49 +1,187 @@
 import json
 import itertools
 from collections import Counter
+from functools import partial
 
-# Load the JSON data
-with open('data/TAFFC_IEEEkeywords.json', 'r') as file:
-    data = json.load(file)
+from external_counter import ExternalPairCounter, parse_memory_budget
+from corpus import CORPUS_ROOT, require_corpus, list_partitions, load_partition, map_partitions, aggregate_partitions
+from keyword_canonicalization import canonicalize_keywords, load_or_build_canonical_index, load_or_build_corpus_canonical_index
 
-# Extract the keywords from each paper
-papers_keywords = [item['IEEE Keywords'] for item in data]
 
-# Count co-occurrences of keyword pairs
-co_occurrence_counter = Counter()
-keyword_counter = Counter()
+def load_papers_keywords(json_file):
+    """
+    Load the JSON data and extract the keywords from each paper.
+    """
+    with open(json_file, 'r') as file:
+        data = json.load(file)
 
-for keywords in papers_keywords:
-    for keyword in keywords:
-        keyword_counter[keyword] += 1
-    for pair in itertools.combinations(sorted(keywords), 2):
-        co_occurrence_counter[pair] += 1
+    return [item['IEEE Keywords'] for item in data]
 
-# Create map file content
-map_lines = ["id\tlabel\tx\ty\tcluster\tweight<Links>\tweight<Total link strength>\tweight<Documents>"]
-keyword_to_index = {}
-index = 1
 
-# Assign an index to each keyword and create map entries
-for keyword, count in keyword_counter.items():
-    if keyword not in keyword_to_index:
+def count_co_occurrences(papers_keywords, canonical_index=None, memory_budget=None):
+    """
+    Count keyword occurrences and co-occurrences of keyword pairs.
+    If a canonical index is given, keyword variants are merged before counting.
+    If a memory budget (in bytes) is given, pairs are counted with an external sort
+    that spills to temporary files instead of in memory.
+    """
+    co_occurrence_counter = Counter() if memory_budget is None else ExternalPairCounter(memory_budget)
+    keyword_counter = Counter()
+
+    for keywords in papers_keywords:
+        if canonical_index is not None:
+            keywords = canonicalize_keywords(keywords, canonical_index)
+        for keyword in keywords:
+            keyword_counter[keyword] += 1
+        co_occurrence_counter.update(itertools.combinations(sorted(keywords), 2))
+
+    return keyword_counter, co_occurrence_counter
+
+
+def save_for_vosviewer(keyword_counter, co_occurrence_counter, map_file_path, network_file_path):
+    """
+    Save the keyword nodes and co-occurrence links in the format required by VOSViewer.
+    """
+    # Create map file content
+    map_lines = ["id\tlabel\tx\ty\tcluster\tweight<Links>\tweight<Total link strength>\tweight<Documents>"]
+    keyword_to_index = {}
+    index = 1
+
+    # Assign an index to each keyword and create map entries
+    for keyword, count in keyword_counter.items():
+        if keyword not in keyword_to_index:
+            keyword_to_index[keyword] = index
+            map_lines.append(f"{index}\t{keyword}\t0\t0\t1\t0\t0\t{count}")
+            index += 1
+
+    # Save map file
+    with open(map_file_path, 'w') as file:
+        file.write("\n".join(map_lines))
+
+    # Create network file content
+    network_lines = []
+    for (k1, k2), weight in co_occurrence_counter.items():
+        network_lines.append(f"{keyword_to_index[k1]}\t{keyword_to_index[k2]}\t{weight}")
+
+    # Save network file
+    with open(network_file_path, 'w') as file:
+        file.write("\n".join(network_lines))
+
+
+def count_partition_co_occurrences(partition, canonical_index=None):
+    """
+    Count the keywords and keyword pairs of one (journal, year) partition in a worker process.
+    Keyword counts are keyed by (journal, keyword) so documents can be reported per journal.
+    """
+    journal, _, path = partition
+    papers_keywords = [entry['IEEE Keywords'] for entry in load_partition(path)]
+    keyword_counter, co_occurrence_counter = count_co_occurrences(papers_keywords, canonical_index)
+
+    journal_keyword_counter = Counter({(journal, keyword): count for keyword, count in keyword_counter.items()})
+    return journal_keyword_counter, co_occurrence_counter
+
+
+def count_corpus_co_occurrences(corpus_root=CORPUS_ROOT, journals=None, canonical_index=None, workers=None,
+                                memory_budget=None):
+    """
+    Count keyword co-occurrences across all journals, one partition per worker, and merge the counts.
+    If a memory budget (in bytes) is given, the partitions' pair counts are merged with an
+    external sort that spills to temporary files instead of in memory.
+    """
+    partitions = list_partitions(corpus_root, journals)
+    count_partition = partial(count_partition_co_occurrences, canonical_index=canonical_index)
+    if memory_budget is None:
+        counters = aggregate_partitions(partitions, count_partition, workers)
+        return counters or (Counter(), Counter())
+
+    journal_keyword_counter = Counter()
+    co_occurrence_counter = ExternalPairCounter(memory_budget)
+    for partition_keywords, partition_pairs in map_partitions(partitions, count_partition, workers):
+        journal_keyword_counter.update(partition_keywords)
+        for (k1, k2), count in partition_pairs.items():
+            co_occurrence_counter.add(k1, k2, count)
+    return journal_keyword_counter, co_occurrence_counter
+
+
+def save_for_vosviewer_by_journal(journal_keyword_counter, co_occurrence_counter, map_file_path, network_file_path):
+    """
+    Save the cross-journal keyword network for VOSViewer, with the number of documents
+    per journal as extra weight columns of the map file.
+    """
+    journals = sorted({journal for journal, _ in journal_keyword_counter})
+
+    keyword_counter = Counter()
+    for (journal, keyword), count in journal_keyword_counter.items():
+        keyword_counter[keyword] += count
+
+    header = "id\tlabel\tx\ty\tcluster\tweight<Links>\tweight<Total link strength>\tweight<Documents>"
+    map_lines = [header + "".join(f"\tweight<{journal} Documents>" for journal in journals)]
+    keyword_to_index = {}
+
+    for index, (keyword, count) in enumerate(keyword_counter.items(), 1):
         keyword_to_index[keyword] = index
-        map_lines.append(f"{index}\t{keyword}\t0\t0\t1\t0\t0\t{count}")
-        index += 1
+        journal_counts = "".join(f"\t{journal_keyword_counter[(journal, keyword)]}" for journal in journals)
+        map_lines.append(f"{index}\t{keyword}\t0\t0\t1\t0\t0\t{count}{journal_counts}")
+
+    with open(map_file_path, 'w') as file:
+        file.write("\n".join(map_lines))
+
+    network_lines = []
+    for (k1, k2), weight in co_occurrence_counter.items():
+        network_lines.append(f"{keyword_to_index[k1]}\t{keyword_to_index[k2]}\t{weight}")
+
+    with open(network_file_path, 'w') as file:
+        file.write("\n".join(network_lines))
+
+
+if __name__ == "__main__":
+    import sys
+
+    json_file = 'data/TAFFC_IEEEkeywords.json'
+    map_file_path = 'data/vos_input_data/keyword_co_occurrence_map.txt'
+    network_file_path = 'data/vos_input_data/keyword_co_occurrence_network.txt'
+
+    if '--corpus' in sys.argv:
+        require_corpus(CORPUS_ROOT)
+
+    # Merge keyword variants only when asked to, so the default output is unchanged
+    canonical_index = None
+    if '--canonical' in sys.argv and '--corpus' in sys.argv:
+        canonical_index = load_or_build_corpus_canonical_index(CORPUS_ROOT)
+    elif '--canonical' in sys.argv:
+        canonical_index = load_or_build_canonical_index(json_file)
+
+    memory_budget = parse_memory_budget(sys.argv)
+
+    if '--approximate' in sys.argv:
+        # Estimate the strongest pairs in one pass with fixed-memory sketches, without building the network
+        from sketches import approximate_top_pairs
 
-# Save map file
-map_file_path = 'data/keyword_co_occurrence_map.txt'
-with open(map_file_path, 'w') as file:
-    file.write("\n".join(map_lines))
+        if '--corpus' in sys.argv:
+            papers_keywords = (entry['IEEE Keywords'] for _, _, path in list_partitions(CORPUS_ROOT)
+                               for entry in load_partition(path))
+        else:
+            papers_keywords = load_papers_keywords(json_file)
+        if canonical_index is not None:
+            papers_keywords = (canonicalize_keywords(keywords, canonical_index) for keywords in papers_keywords)
 
-# Create network file content
-network_lines = []
-for (k1, k2), weight in co_occurrence_counter.items():
-    network_lines.append(f"{keyword_to_index[k1]}\t{keyword_to_index[k2]}\t{weight}")
+        strongest_pairs, error_bounds = approximate_top_pairs(papers_keywords, top_n=20)
+        for (k1, k2), estimate in strongest_pairs:
+            print(f"{k1}\t{k2}\t{estimate}")
+        print(f"Estimates overcount by at most {error_bounds['Space-Saving bound']:.1f}")
+        sys.exit()
 
-# Save network file
-network_file_path = 'data/keyword_co_occurrence_network.txt'
-with open(network_file_path, 'w') as file:
-    file.write("\n".join(network_lines))
+    if '--corpus' in sys.argv:
+        # Build one network across all journals in the partitioned corpus
+        journal_keyword_counter, co_occurrence_counter = count_corpus_co_occurrences(
+            CORPUS_ROOT, canonical_index=canonical_index, memory_budget=memory_budget
+        )
+        save_for_vosviewer_by_journal(journal_keyword_counter, co_occurrence_counter,
+                                      'data/vos_input_data/keyword_co_occurrence_by_journal_map.txt',
+                                      'data/vos_input_data/keyword_co_occurrence_by_journal_network.txt')
+    else:
+        papers_keywords = load_papers_keywords(json_file)
+        keyword_counter, co_occurrence_counter = count_co_occurrences(papers_keywords, canonical_index, memory_budget)
+        save_for_vosviewer(keyword_counter, co_occurrence_counter, map_file_path, network_file_path)
 
-(map_file_path, network_file_path)
+    print("VOSViewer files created successfully.")
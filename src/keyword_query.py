@@ -0,0 +1,173 @@
+import json
+import argparse
+from collections import defaultdict
+
+from keyword_canonicalization import canonicalize_keywords, load_or_build_canonical_index
+
+
+# Posting lists are stored as Python ints used as bitmaps: bit i is set when paper i
+# is in the list, so a conjunction is a single "&" and a count is a popcount.
+
+def build_keyword_index(json_file, canonical_index=None):
+    """
+    Load the corpus once and build the inverted indexes used by all queries:
+    keyword -> papers, year -> papers and (year, issue) -> papers.
+    """
+    with open(json_file, 'r') as file:
+        data = json.load(file)
+
+    titles = []
+    keyword_postings = defaultdict(int)
+    year_postings = defaultdict(int)
+    issue_postings = defaultdict(int)
+
+    for paper_id, entry in enumerate(data):
+        bit = 1 << paper_id
+        year = entry.get("Year", "")
+        issue = entry.get("Issue #", "")
+        keywords = entry.get("IEEE Keywords", [])
+        if canonical_index is not None:
+            keywords = canonicalize_keywords(keywords, canonical_index)
+
+        titles.append(entry.get("Title", ""))
+        year_postings[year] |= bit
+        issue_postings[(year, issue)] |= bit
+        for keyword in keywords:
+            keyword_postings[keyword] |= bit
+
+    return {
+        "titles": titles,
+        "all": (1 << len(titles)) - 1,
+        "keywords": dict(keyword_postings),
+        "years": dict(year_postings),
+        "issues": dict(issue_postings),
+        "canonical_index": canonical_index,
+    }
+
+
+def bitmap_to_ids(bitmap):
+    """
+    Convert a posting bitmap into the list of paper ids it contains.
+    """
+    ids = []
+    while bitmap:
+        low_bit = bitmap & -bitmap
+        ids.append(low_bit.bit_length() - 1)
+        bitmap ^= low_bit
+    return ids
+
+
+def year_range_bitmap(index, start_year=None, end_year=None):
+    """
+    Return the bitmap of papers published between start_year and end_year (inclusive).
+    """
+    if start_year is None and end_year is None:
+        return index["all"]
+
+    bitmap = 0
+    for year, postings in index["years"].items():
+        if start_year is not None and year < start_year:
+            continue
+        if end_year is not None and year > end_year:
+            continue
+        bitmap |= postings
+    return bitmap
+
+
+def resolve_keyword(index, keyword):
+    """
+    Map a query keyword to the label used in the index.
+    """
+    canonical_index = index["canonical_index"]
+    if canonical_index is None:
+        return keyword
+    return canonical_index.get(keyword, keyword)
+
+
+def papers_with_keywords(index, keywords, start_year=None, end_year=None):
+    """
+    Return the bitmap of papers tagged with all of the given keywords
+    and published between start_year and end_year (inclusive).
+    """
+    bitmap = year_range_bitmap(index, start_year, end_year)
+    for keyword in keywords:
+        bitmap &= index["keywords"].get(resolve_keyword(index, keyword), 0)
+    return bitmap
+
+
+def count_by_period(index, keywords, period='year'):
+    """
+    Count the papers tagged with all of the given keywords per year or per (year, issue).
+    """
+    bitmap = papers_with_keywords(index, keywords)
+    postings = index["years"] if period == 'year' else index["issues"]
+
+    counts = {}
+    for key in sorted(postings):
+        counts[key] = (postings[key] & bitmap).bit_count()
+    return counts
+
+
+def top_co_keywords(index, keyword, top_n=10, start_year=None, end_year=None):
+    """
+    Return the top N keywords co-occurring with the given keyword, as (keyword, count) pairs.
+    """
+    keyword = resolve_keyword(index, keyword)
+    bitmap = papers_with_keywords(index, [keyword], start_year, end_year)
+    if not bitmap:
+        return []
+
+    neighbours = []
+    for other, postings in index["keywords"].items():
+        if other == keyword:
+            continue
+        count = (postings & bitmap).bit_count()
+        if count:
+            neighbours.append((other, count))
+
+    neighbours.sort(key=lambda item: (-item[1], item[0]))
+    return neighbours[:top_n]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Ad-hoc keyword statistics over the TAFFC corpus.")
+    parser.add_argument('--json-file', default='data/TAFFC_IEEEkeywords.json')
+    parser.add_argument('--canonical', action='store_true', help="merge keyword variants before indexing")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    papers_parser = subparsers.add_parser('papers', help="list papers tagged with all of the keywords")
+    papers_parser.add_argument('keywords', nargs='+')
+    papers_parser.add_argument('--start-year', type=int)
+    papers_parser.add_argument('--end-year', type=int)
+
+    counts_parser = subparsers.add_parser('counts', help="count papers tagged with all of the keywords per period")
+    counts_parser.add_argument('keywords', nargs='+')
+    counts_parser.add_argument('--period', choices=['year', 'issue'], default='year')
+
+    neighbours_parser = subparsers.add_parser('neighbours', help="top co-occurring keywords of a keyword")
+    neighbours_parser.add_argument('keyword')
+    neighbours_parser.add_argument('--top-n', type=int, default=10)
+    neighbours_parser.add_argument('--start-year', type=int)
+    neighbours_parser.add_argument('--end-year', type=int)
+
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+
+    canonical_index = load_or_build_canonical_index(args.json_file) if args.canonical else None
+    index = build_keyword_index(args.json_file, canonical_index)
+
+    if args.command == 'papers':
+        bitmap = papers_with_keywords(index, args.keywords, args.start_year, args.end_year)
+        for paper_id in bitmap_to_ids(bitmap):
+            print(index["titles"][paper_id])
+        print(f"Papers: {bitmap.bit_count()}")
+    elif args.command == 'counts':
+        for period, count in count_by_period(index, args.keywords, args.period).items():
+            label = f"{period[0]}-Q{period[1]}" if args.period == 'issue' else period
+            print(f"{label}: {count}")
+    elif args.command == 'neighbours':
+        for keyword, count in top_co_keywords(index, args.keyword, args.top_n, args.start_year, args.end_year):
+            print(f"{keyword}: {count}")
@@ -1,9 +1,6 @@
-import pandas as pd
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-import numpy as np
-
 def read_csv(file_path):
+    import pandas as pd
+
     # Read the CSV file
     df = pd.read_csv(file_path)
     return df
@@ -28,6 +25,8 @@ def generate_all_periods(start_year, start_quarter, end_year, end_quarter):
     return periods
 
 def prepare_data_for_plot(df, top_keywords):
+    import pandas as pd
+
     # Filter the data to include only the top keywords and up to the period 2024-Q2
     filtered_df = df[df['Keyword'].isin(top_keywords)].copy()
     
@@ -58,11 +57,16 @@ def prepare_data_for_plot(df, top_keywords):
     return complete_df
 
 def get_yaxis_range(df):
+    import numpy as np
+
     max_ratio = df['Ratio'].max()
     max_log_ratio = np.log(max_ratio + 1)
     return max_ratio, max_log_ratio
 
 def plot_keyword_trends(df, top_keywords, smoothing_window=3):
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+
     fig = make_subplots(rows=1, cols=1)
     
     colors = [
@@ -108,6 +112,10 @@ def plot_keyword_trends(df, top_keywords, smoothing_window=3):
     fig.show()
 
 def plot_keyword_trends_log(df, top_keywords, smoothing_window=3):
+    import numpy as np
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+
     fig = make_subplots(rows=1, cols=1)
     
     colors = [
@@ -153,13 +161,21 @@ def plot_keyword_trends_log(df, top_keywords, smoothing_window=3):
     fig.show()
 
 if __name__ == '__main__':
+    import sys
+
     csv_file = 'data/TAFFC_keywords_by_issue.csv'
 
     # Read the CSV file
     df = read_csv(csv_file)
 
-    # Get the top 15 keywords
-    top_keywords = get_top_keywords(df, top_n=15)
+    # Get the top 15 keywords, or with --approximate estimate them in one pass over
+    # the CSV with fixed-memory sketches instead of grouping the whole DataFrame
+    if '--approximate' in sys.argv:
+        from sketches import approximate_top_csv_keywords
+        approximate, _ = approximate_top_csv_keywords(csv_file, top_n=15)
+        top_keywords = [keyword for keyword, _ in approximate]
+    else:
+        top_keywords = get_top_keywords(df, top_n=15)
 
     # Prepare data for plotting
     df_prepared = prepare_data_for_plot(df, top_keywords)
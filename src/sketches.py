@@ -0,0 +1,199 @@
+import csv
+import math
+import heapq
+import itertools
+from array import array
+
+
+class CountMinSketch:
+    """
+    Count-Min sketch: a depth x width table of counters.
+    Estimates never undercount, and overcount by at most epsilon * N with
+    probability 1 - delta, where N is the total of all counts added.
+    """
+
+    def __init__(self, epsilon=0.001, delta=0.01):
+        self.epsilon = epsilon
+        self.delta = delta
+        self.width = math.ceil(math.e / epsilon)
+        self.depth = math.ceil(math.log(1 / delta))
+        self.rows = [array('Q', bytes(8 * self.width)) for _ in range(self.depth)]
+        self.total = 0
+
+    def columns(self, item):
+        return [hash((seed, item)) % self.width for seed in range(self.depth)]
+
+    def add(self, item, count=1):
+        for row, column in zip(self.rows, self.columns(item)):
+            row[column] += count
+        self.total += count
+
+    def estimate(self, item):
+        return min(row[column] for row, column in zip(self.rows, self.columns(item)))
+
+    def error_bound(self):
+        return self.epsilon * self.total
+
+
+class SpaceSaving:
+    """
+    Space-Saving heavy hitters: keeps at most `capacity` counters. When a new item
+    arrives and all counters are taken, it replaces the item with the smallest count
+    and inherits that count as its error. Any item with a true count above
+    N / capacity is guaranteed to be kept.
+    """
+
+    def __init__(self, capacity=1000):
+        self.capacity = capacity
+        self.counts = {}
+        self.errors = {}
+        # Min-heap of (count, item) with stale entries skipped lazily
+        self.heap = []
+        self.total = 0
+
+    def add(self, item, count=1):
+        self.total += count
+        if item not in self.counts and len(self.counts) >= self.capacity:
+            min_count, min_item = self.pop_min()
+            del self.counts[min_item]
+            del self.errors[min_item]
+            self.counts[item] = min_count
+            self.errors[item] = min_count
+
+        self.counts[item] = self.counts.get(item, 0) + count
+        self.errors.setdefault(item, 0)
+        heapq.heappush(self.heap, (self.counts[item], item))
+
+        # Drop the stale heap entries once they outnumber the live ones
+        if len(self.heap) > 4 * self.capacity:
+            self.heap = [(count, item) for item, count in self.counts.items()]
+            heapq.heapify(self.heap)
+
+    def pop_min(self):
+        while True:
+            count, item = heapq.heappop(self.heap)
+            if self.counts.get(item) == count:
+                return count, item
+
+    def top(self, top_n):
+        """
+        Return the top N (item, count, error) triples; the true count is between count - error and count.
+        """
+        return heapq.nlargest(top_n, ((item, count, self.errors[item]) for item, count in self.counts.items()),
+                              key=lambda entry: entry[1])
+
+    def error_bound(self):
+        return self.total / self.capacity
+
+
+def approximate_top_counts(items, top_n=10, capacity=1000, epsilon=0.001, delta=0.01):
+    """
+    Find the top N items of a stream in one pass with fixed memory.
+    Returns the (item, estimate) pairs and the error bounds of the run.
+    """
+    return approximate_top_weighted(((item, 1) for item in items), top_n, capacity, epsilon, delta)
+
+
+def approximate_top_weighted(item_counts, top_n=10, capacity=1000, epsilon=0.001, delta=0.01):
+    """
+    Find the top N items of a stream of (item, count) pairs in one pass with fixed memory.
+    Space-Saving selects the candidates and each estimate is the smaller of its
+    Space-Saving and Count-Min counts, since both only ever overcount.
+    Returns the (item, estimate) pairs and the error bounds of the run.
+    """
+    heavy_hitters = SpaceSaving(capacity)
+    sketch = CountMinSketch(epsilon, delta)
+    for item, count in item_counts:
+        heavy_hitters.add(item, count)
+        sketch.add(item, count)
+
+    candidates = [(item, min(count, sketch.estimate(item))) for item, count, _ in heavy_hitters.top(capacity)]
+    candidates.sort(key=lambda entry: (-entry[1], entry[0]))
+
+    error_bounds = {
+        "Stream length": heavy_hitters.total,
+        "Space-Saving bound": heavy_hitters.error_bound(),
+        "Count-Min bound": sketch.error_bound(),
+        "Count-Min confidence": 1 - delta,
+    }
+    return candidates[:top_n], error_bounds
+
+
+def approximate_top_keywords(papers_keywords, top_n=10, capacity=1000, epsilon=0.001, delta=0.01):
+    """
+    Approximate top N keywords of a stream of per-paper keyword lists.
+    """
+    keywords = (keyword for keywords in papers_keywords for keyword in keywords)
+    return approximate_top_counts(keywords, top_n, capacity, epsilon, delta)
+
+
+def approximate_top_pairs(papers_keywords, top_n=10, capacity=1000, epsilon=0.001, delta=0.01):
+    """
+    Approximate top N co-occurring keyword pairs of a stream of per-paper keyword lists.
+    """
+    pairs = (pair for keywords in papers_keywords for pair in itertools.combinations(sorted(keywords), 2))
+    return approximate_top_counts(pairs, top_n, capacity, epsilon, delta)
+
+
+def approximate_top_csv_keywords(csv_file, top_n=10, capacity=1000, epsilon=0.001, delta=0.01):
+    """
+    Approximate top N keywords of a keyword frequency CSV by their summed Frequency,
+    reading the file row by row instead of loading it into a DataFrame.
+    """
+    with open(csv_file, 'r', newline='') as file:
+        rows = ((row['Keyword'], int(row['Frequency'])) for row in csv.DictReader(file))
+        return approximate_top_weighted(rows, top_n, capacity, epsilon, delta)
+
+
+def compare_with_exact(approximate, error_bounds, exact_counter, top_n):
+    """
+    Compare approximate top N results with exact counts: the share of the exact
+    top N that was found, the largest overcount, and how many of the exact top N
+    are above the Space-Saving bound N / capacity (only those are guaranteed to be kept).
+    Items tied with the exact N-th count are all accepted as part of the top N.
+    """
+    exact_top = exact_counter.most_common(top_n)
+    if not exact_top:
+        return {"Recall": 1.0, "Max overcount": 0}
+
+    threshold = exact_top[-1][1]
+    found_items = {item for item, _ in approximate}
+    found = sum(1 for item in found_items if exact_counter[item] >= threshold)
+    guaranteed = {item for item, count in exact_counter.items()
+                  if count >= threshold and count > error_bounds["Space-Saving bound"]}
+    max_error = max((estimate - exact_counter[item] for item, estimate in approximate), default=0)
+    return {
+        "Recall": found / len(exact_top),
+        "Exact top N above the Space-Saving bound": min(len(guaranteed), len(exact_top)),
+        "Found of those": len(guaranteed & found_items),
+        "Max overcount": max_error,
+    }
+
+
+if __name__ == "__main__":
+    import sys
+    from keyword_network import load_papers_keywords, count_co_occurrences
+
+    json_file = 'data/TAFFC_IEEEkeywords.json'
+    top_n = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    # Kept below the number of distinct keywords (about 800), so the sketches actually evict
+    capacity = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+    papers_keywords = load_papers_keywords(json_file)
+
+    # Validate the approximate results against the exact counters
+    keyword_counter, co_occurrence_counter = count_co_occurrences(papers_keywords)
+    runs = [
+        ("Keywords", approximate_top_keywords(papers_keywords, top_n, capacity), keyword_counter),
+        ("Pairs", approximate_top_pairs(papers_keywords, top_n, capacity), co_occurrence_counter),
+    ]
+
+    for name, (approximate, error_bounds), exact_counter in runs:
+        print(f"{name}:")
+        if capacity >= len(exact_counter):
+            print(f"  Capacity {capacity} >= {len(exact_counter)} distinct items: nothing is evicted, so the counts are exact")
+        for item, estimate in approximate:
+            print(f"  {item}: {estimate} (exact {exact_counter[item]})")
+        comparison = compare_with_exact(approximate, error_bounds, exact_counter, top_n)
+        for bound_name, value in {**error_bounds, **comparison}.items():
+            print(f"  {bound_name}: {value}")
@@ -0,0 +1,300 @@
+import os
+import csv
+import json
+import time
+import argparse
+import threading
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+DEFAULT_PATHS = {
+    "year_csv": 'data/TAFFC_keywords_by_year.csv',
+    "issue_csv": 'data/TAFFC_keywords_by_issue.csv',
+    "map_file": 'data/vos_input_data/keyword_co_occurrence_map.txt',
+    "network_file": 'data/vos_input_data/keyword_co_occurrence_network.txt',
+}
+
+MAX_CACHED_RESPONSES = 512
+
+
+def check_complete(row, file_path):
+    """
+    Raise ValueError for a CSV row with missing fields, as left by a file caught half-written.
+    """
+    if None in row.values():
+        raise ValueError(f"{file_path} has an incomplete row, it may still be being written")
+
+
+def read_keyword_matrix(csv_file, period_of_row):
+    """
+    Read a keyword frequency CSV into a keyword x period matrix of (frequency, ratio) values.
+    """
+    matrix = defaultdict(dict)
+    periods = set()
+    with open(csv_file, 'r', newline='') as file:
+        for row in csv.DictReader(file):
+            check_complete(row, csv_file)
+            period = period_of_row(row)
+            periods.add(period)
+            matrix[row['Keyword']][period] = (int(row['Frequency']), float(row['Ratio']))
+    return dict(matrix), sorted(periods)
+
+
+def read_co_occurrence_graph(map_file, network_file):
+    """
+    Read the VOSViewer map and network files into a keyword adjacency dict
+    and the number of documents per keyword.
+    """
+    labels = {}
+    documents = {}
+    with open(map_file, 'r') as file:
+        for row in csv.DictReader(file, delimiter='\t'):
+            check_complete(row, map_file)
+            labels[row['id']] = row['label']
+            documents[row['label']] = int(row['weight<Documents>'])
+
+    adjacency = defaultdict(dict)
+    with open(network_file, 'r') as file:
+        for line in file:
+            if not line.strip():
+                continue
+            source, target, weight = line.split('\t')
+            source, target = labels[source], labels[target]
+            adjacency[source][target] = int(weight)
+            adjacency[target][source] = int(weight)
+
+    return dict(adjacency), documents
+
+
+def load_trend_data(paths):
+    """
+    Load every pipeline output the server needs into memory.
+    """
+    by_year, years = read_keyword_matrix(paths["year_csv"], lambda row: row['Year'])
+    by_issue, issues = read_keyword_matrix(paths["issue_csv"], lambda row: f"{row['Year']}-Q{row['Issue']}")
+    adjacency, documents = read_co_occurrence_graph(paths["map_file"], paths["network_file"])
+
+    totals = {keyword: sum(frequency for frequency, _ in values.values()) for keyword, values in by_year.items()}
+
+    return {
+        "year": (by_year, years),
+        "issue": (by_issue, issues),
+        "totals": totals,
+        "adjacency": adjacency,
+        "documents": documents,
+    }
+
+
+class TrendStore:
+    """
+    Holds the loaded data and the response cache, and reloads both when any input file changes.
+    """
+
+    def __init__(self, paths):
+        self.paths = paths
+        self.lock = threading.Lock()
+        self.cache = {}
+        self.mtimes = self.current_mtimes()
+        self.data = load_trend_data(paths)
+
+    def current_mtimes(self):
+        return {name: os.path.getmtime(path) for name, path in self.paths.items()}
+
+    def reload_if_changed(self):
+        mtimes = self.current_mtimes()
+        if mtimes == self.mtimes:
+            return False
+
+        data = load_trend_data(self.paths)
+        with self.lock:
+            self.data = data
+            self.mtimes = mtimes
+            self.cache.clear()
+        return True
+
+    def watch(self, interval):
+        """
+        Poll the input files and hot-reload the data when the pipeline rewrites them.
+        """
+        while True:
+            time.sleep(interval)
+            try:
+                if self.reload_if_changed():
+                    print("Pipeline outputs changed, data reloaded.")
+            except Exception as error:
+                # A file may be caught half-written; keep serving the old data and retry,
+                # since an error escaping here would stop the watcher thread for good
+                print(f"Reload failed: {error!r}")
+
+    def respond(self, endpoint, params):
+        """
+        Return the JSON body for an API request, from the cache when possible.
+        """
+        key = (endpoint, tuple(sorted((name, tuple(values)) for name, values in params.items())))
+        with self.lock:
+            data = self.data
+            body = self.cache.get(key)
+        if body is not None:
+            return body
+
+        body = json.dumps(API_ENDPOINTS[endpoint](data, params)).encode('utf-8')
+        with self.lock:
+            if len(self.cache) >= MAX_CACHED_RESPONSES:
+                self.cache.pop(next(iter(self.cache)))
+            self.cache[key] = body
+        return body
+
+
+def get_top_keywords(data, top_n=10):
+    totals = data["totals"]
+    return sorted(totals, key=lambda keyword: (-totals[keyword], keyword))[:top_n]
+
+
+def api_keywords(data, params):
+    return sorted(data["totals"])
+
+
+def api_top(data, params):
+    top_n = int(params.get('n', ['10'])[0])
+    return [{"Keyword": keyword, "Frequency": data["totals"][keyword]} for keyword in get_top_keywords(data, top_n)]
+
+
+def api_trends(data, params):
+    period = params.get('period', ['year'])[0]
+    if period not in ('year', 'issue'):
+        raise ValueError(f"period must be 'year' or 'issue', not {period!r}")
+    column = 1 if params.get('metric', ['Frequency'])[0] == 'Ratio' else 0
+    matrix, periods = data[period]
+    keywords = params.get('keyword') or get_top_keywords(data)
+
+    return {
+        "periods": periods,
+        "series": {
+            keyword: [matrix.get(keyword, {}).get(p, (0, 0.0))[column] for p in periods]
+            for keyword in keywords
+        },
+    }
+
+
+def api_ego(data, params):
+    keyword = params.get('keyword', [''])[0]
+    top_n = int(params.get('n', ['25'])[0])
+    adjacency = data["adjacency"]
+
+    neighbours = adjacency.get(keyword, {})
+    nodes = [keyword] + sorted(neighbours, key=lambda other: (-neighbours[other], other))[:top_n]
+    node_set = set(nodes)
+
+    edges = []
+    for source in nodes:
+        for target, weight in adjacency.get(source, {}).items():
+            if target in node_set and source < target:
+                edges.append({"Source": source, "Target": target, "Weight": weight})
+
+    return {
+        "nodes": [{"Keyword": node, "Documents": data["documents"].get(node, 0)} for node in nodes if node in adjacency],
+        "edges": edges,
+    }
+
+
+API_ENDPOINTS = {
+    '/api/keywords': api_keywords,
+    '/api/top': api_top,
+    '/api/trends': api_trends,
+    '/api/ego': api_ego,
+}
+
+
+INDEX_PAGE = b"""<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>TAFFC keyword trends</title>
+<script src="https://cdn.plot.ly/plotly-2.35.2.min.js"></script>
+</head>
+<body>
+<form id="query">
+  <input id="keywords" size="80" placeholder="Keywords, comma separated (default: top 10)">
+  <select id="period"><option value="year">Year</option><option value="issue">Issue</option></select>
+  <select id="metric"><option>Frequency</option><option>Ratio</option></select>
+  <button>Plot</button>
+</form>
+<div id="trends" style="height:600px"></div>
+<script>
+async function plot(event) {
+  if (event) event.preventDefault();
+  const params = new URLSearchParams();
+  document.getElementById('keywords').value.split(',').map(k => k.trim()).filter(k => k)
+    .forEach(k => params.append('keyword', k));
+  params.set('period', document.getElementById('period').value);
+  params.set('metric', document.getElementById('metric').value);
+  const response = await fetch('/api/trends?' + params);
+  const trends = await response.json();
+  const traces = Object.entries(trends.series).map(([keyword, values]) =>
+    ({x: trends.periods, y: values, mode: 'lines', name: keyword}));
+  Plotly.newPlot('trends', traces, {
+    title: 'Keyword Trends Over Time', hovermode: 'x unified', template: 'plotly_white',
+    xaxis: {title: document.getElementById('period').value, tickangle: 45},
+    yaxis: {title: document.getElementById('metric').value},
+  });
+}
+document.getElementById('query').addEventListener('submit', plot);
+plot();
+</script>
+</body>
+</html>
+"""
+
+
+class TrendRequestHandler(BaseHTTPRequestHandler):
+    store = None
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == '/':
+            self.send_body(200, 'text/html; charset=utf-8', INDEX_PAGE)
+        elif url.path in API_ENDPOINTS:
+            try:
+                body = self.store.respond(url.path, parse_qs(url.query))
+            except (KeyError, ValueError) as error:
+                body = json.dumps({"error": str(error)}).encode('utf-8')
+                self.send_body(400, 'application/json', body)
+                return
+            self.send_body(200, 'application/json', body)
+        else:
+            self.send_body(404, 'application/json', b'{"error": "not found"}')
+
+    def send_body(self, status, content_type, body):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Serve precomputed keyword trends and networks.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--watch-interval', type=float, default=2.0, help="seconds between checks for changed inputs")
+    for name, path in DEFAULT_PATHS.items():
+        parser.add_argument('--' + name.replace('_', '-'), default=path)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+
+    store = TrendStore({name: getattr(args, name) for name in DEFAULT_PATHS})
+    TrendRequestHandler.store = store
+    threading.Thread(target=store.watch, args=(args.watch_interval,), daemon=True).start()
+
+    server = ThreadingHTTPServer((args.host, args.port), TrendRequestHandler)
+    print(f"Serving keyword trends on http://{args.host}:{args.port}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -0,0 +1,55 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from bib_dedup import DedupIndex
+
+
+def make_entry(title, year, doi=None):
+    entry = {'title': title, 'year': year}
+    if doi is not None:
+        entry['doi'] = doi
+    return entry
+
+
+def test_same_title_and_year_with_different_dois_are_not_duplicates():
+    dedup_index = DedupIndex()
+    assert not dedup_index.is_duplicate(make_entry('CIS Publication Spotlight', '2023', '10.1109/MCI.2023.1'))
+    assert not dedup_index.is_duplicate(make_entry('CIS Publication Spotlight', '2023', '10.1109/MCI.2023.2'))
+
+
+def test_same_doi_is_a_duplicate():
+    dedup_index = DedupIndex()
+    assert not dedup_index.is_duplicate(make_entry('Affect Detection', '2020', '10.1109/TAFFC.2020.1'))
+    assert dedup_index.is_duplicate(make_entry('Affect detection: a review', '2020', 'https://doi.org/10.1109/TAFFC.2020.1'))
+    assert dedup_index.stats['Duplicates by doi'] == 1
+
+
+def test_same_title_and_year_matches_when_one_entry_has_no_doi():
+    dedup_index = DedupIndex()
+    assert not dedup_index.is_duplicate(make_entry('Affect Detection', '2020'))
+    assert dedup_index.is_duplicate(make_entry('{A}ffect detection', '2020', '10.1109/TAFFC.2020.1'))
+    assert dedup_index.is_duplicate(make_entry('Affect Detection.', '2020'))
+    assert dedup_index.stats['Duplicates by title'] == 2
+
+
+def test_copy_without_doi_belongs_to_the_first_doi_that_matches_it():
+    dedup_index = DedupIndex()
+    assert not dedup_index.is_duplicate(make_entry('Affect Detection', '2020'))
+    assert dedup_index.is_duplicate(make_entry('Affect Detection', '2020', '10.1109/TAFFC.2020.1'))
+    assert not dedup_index.is_duplicate(make_entry('Affect Detection', '2020', '10.1109/TAFFC.2020.2'))
+
+
+def test_same_title_in_another_year_is_not_a_duplicate():
+    dedup_index = DedupIndex()
+    assert not dedup_index.is_duplicate(make_entry('Editorial', '2020'))
+    assert not dedup_index.is_duplicate(make_entry('Editorial', '2021'))
+
+
+def test_fingerprint_map_keeps_values_when_it_grows():
+    dedup_index = DedupIndex()
+    for number in range(5000):
+        dedup_index.is_duplicate(make_entry(f'Paper {number}', '2020', f'10.1/{number}'))
+    assert not dedup_index.is_duplicate(make_entry('Paper 17', '2020', '10.1/other'))
+    assert dedup_index.is_duplicate(make_entry('Paper 17', '2020'))
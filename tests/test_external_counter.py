@@ -0,0 +1,91 @@
+import os
+import sys
+import random
+from collections import Counter
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+import external_counter
+from external_counter import ExternalPairCounter, parse_memory_budget
+
+# A budget of zero gives the smallest buffer, so a few thousand pairs already spill to several runs
+TINY_BUDGET = 0
+
+
+def random_pairs(count, labels=200, seed=0):
+    generator = random.Random(seed)
+    return [(f"k{generator.randrange(labels)}", f"k{generator.randrange(labels)}") for _ in range(count)]
+
+
+def test_matches_counter_across_many_runs():
+    pairs = random_pairs(20000)
+    with ExternalPairCounter(TINY_BUDGET) as counter:
+        counter.update(pairs)
+        assert dict(counter.items()) == Counter(pairs)
+        assert len(counter.runs) > 1
+
+
+def test_multi_pass_merge_matches_counter(monkeypatch):
+    # Lower the fan-in so the runs have to be merged in several passes
+    monkeypatch.setattr(external_counter, 'MAX_FAN_IN', 3)
+    pairs = random_pairs(20000, seed=1)
+    with ExternalPairCounter(TINY_BUDGET) as counter:
+        counter.update(pairs)
+        assert dict(counter.items()) == Counter(pairs)
+        assert len(counter.runs) <= 3
+
+
+def test_items_again_after_more_adds():
+    first, second = random_pairs(5000, seed=2), random_pairs(5000, seed=3)
+    with ExternalPairCounter(TINY_BUDGET) as counter:
+        counter.update(first)
+        assert dict(counter.items()) == Counter(first)
+        assert dict(counter.items()) == Counter(first)
+
+        counter.update(second)
+        assert dict(counter.items()) == Counter(first + second)
+
+
+def test_integer_weights_give_int_totals():
+    with ExternalPairCounter(TINY_BUDGET) as counter:
+        counter.update(random_pairs(3000, seed=4))
+        counter.add('a', 'b', 2)
+        assert all(type(count) is int for _, count in counter.items())
+
+
+def test_fractional_weights_give_float_totals():
+    with ExternalPairCounter(TINY_BUDGET) as counter:
+        counter.add('a', 'b')
+        counter.add('a', 'b', 0.5)
+        counter.add('b', 'c')
+        assert dict(counter.items()) == {('a', 'b'): 1.5, ('b', 'c'): 1.0}
+        assert all(type(count) is float for _, count in counter.items())
+
+
+def test_close_removes_the_runs():
+    counter = ExternalPairCounter(TINY_BUDGET)
+    counter.update(random_pairs(3000, seed=5))
+    counter.flush()
+    run_directory = counter.tmp_dir.name
+    assert os.listdir(run_directory)
+
+    counter.close()
+    assert not os.path.exists(run_directory)
+
+
+def test_parse_memory_budget():
+    assert parse_memory_budget(['script.py']) is None
+    assert parse_memory_budget(['script.py', '--memory-budget', '256']) == 256 * 2**20
+
+
+@pytest.mark.parametrize('argv', [
+    ['script.py', '--memory-budget'],
+    ['script.py', '--memory-budget', 'lots'],
+    ['script.py', '--memory-budget', '0'],
+])
+def test_parse_memory_budget_rejects_bad_values(argv):
+    with pytest.raises(SystemExit) as exit_info:
+        parse_memory_budget(argv)
+    assert '--memory-budget' in str(exit_info.value.code)
@@ -0,0 +1,20 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from import_time_check import IMPORT_BUDGETS_MS, measure_import
+
+
+@pytest.mark.parametrize('module', sorted(IMPORT_BUDGETS_MS))
+def test_no_heavy_modules_loaded(module):
+    _, heavy_loaded = measure_import(module)
+    assert heavy_loaded == []
+
+
+@pytest.mark.parametrize('module', sorted(IMPORT_BUDGETS_MS))
+def test_import_time_within_budget(module):
+    import_ms, _ = measure_import(module)
+    assert import_ms <= IMPORT_BUDGETS_MS[module]
@@ -0,0 +1,70 @@
+import os
+import csv
+import sys
+from collections import Counter
+
+import pytest
+
+REPO_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_DIRECTORY, 'src'))
+
+from keyword_network import load_papers_keywords, count_co_occurrences
+from sketches import approximate_top_keywords, approximate_top_pairs, approximate_top_csv_keywords
+
+JSON_FILE = os.path.join(REPO_DIRECTORY, 'data', 'TAFFC_IEEEkeywords.json')
+YEAR_CSV_FILE = os.path.join(REPO_DIRECTORY, 'data', 'TAFFC_keywords_by_year.csv')
+
+TOP_N = 20
+# Well below the number of distinct keywords (about 800) and pairs, so the sketches evict
+CAPACITY = 200
+
+
+def assert_exact_guarantees(approximate, error_bounds, exact_counter):
+    """
+    Check that no estimate undercounts and that every exact top N item above the
+    Space-Saving bound N / capacity is found. Items tied with the exact N-th count
+    are interchangeable, so only as many of them as fit in the top N are required.
+    """
+    found = {item for item, _ in approximate}
+    for item, estimate in approximate:
+        assert estimate >= exact_counter[item]
+
+    threshold = exact_counter.most_common(TOP_N)[-1][1]
+    bound = error_bounds["Space-Saving bound"]
+    above_threshold = {item for item, count in exact_counter.items() if count > threshold and count > bound}
+    guaranteed = {item for item, count in exact_counter.items() if count >= threshold and count > bound}
+    assert above_threshold <= found
+    assert len(guaranteed & found) == min(len(guaranteed), TOP_N)
+
+
+@pytest.fixture(scope='module')
+def papers_keywords():
+    return load_papers_keywords(JSON_FILE)
+
+
+@pytest.fixture(scope='module')
+def exact_counters(papers_keywords):
+    keyword_counter, co_occurrence_counter = count_co_occurrences(papers_keywords)
+    return {'keywords': keyword_counter, 'pairs': co_occurrence_counter}
+
+
+@pytest.mark.parametrize('kind, approximate_top', [
+    ('keywords', approximate_top_keywords),
+    ('pairs', approximate_top_pairs),
+])
+def test_approximate_top_matches_exact_guarantees(papers_keywords, exact_counters, kind, approximate_top):
+    exact_counter = exact_counters[kind]
+    assert len(exact_counter) > CAPACITY
+
+    approximate, error_bounds = approximate_top(papers_keywords, TOP_N, CAPACITY)
+    assert_exact_guarantees(approximate, error_bounds, exact_counter)
+
+
+def test_approximate_top_csv_keywords_matches_summed_frequencies():
+    exact_counter = Counter()
+    with open(YEAR_CSV_FILE, 'r', newline='') as file:
+        for row in csv.DictReader(file):
+            exact_counter[row['Keyword']] += int(row['Frequency'])
+
+    approximate, error_bounds = approximate_top_csv_keywords(YEAR_CSV_FILE, TOP_N, CAPACITY)
+    assert_exact_guarantees(approximate, error_bounds, exact_counter)